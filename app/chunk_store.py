@@ -0,0 +1,61 @@
+import json
+import mmap
+import numpy as np
+from typing import Iterator, List, Union
+from app.models import Document
+
+
+def write_chunk_store(documents: List[Document], data_path: str, offsets_path: str):
+    """
+    Write documents as concatenated UTF-8 JSON records plus an offsets array,
+    so they can be memory-mapped instead of unpickled into every process.
+    """
+    offsets = np.zeros(len(documents) + 1, dtype=np.int64)
+
+    with open(data_path, "wb") as f:
+        for i, doc in enumerate(documents):
+            record = json.dumps(
+                {"content": doc.content, "metadata": doc.metadata},
+                ensure_ascii=False
+            ).encode("utf-8")
+            f.write(record)
+            offsets[i + 1] = offsets[i] + len(record)
+
+    with open(offsets_path, "wb") as f:
+        np.save(f, offsets)
+
+
+class MmapChunkStore:
+    """
+    Read-only, list-like view over a chunk store written by write_chunk_store.
+
+    Records are decoded on access from a shared read-only mapping, so N
+    processes opening the same files share one physical copy via the page cache.
+    """
+
+    def __init__(self, data_path: str, offsets_path: str):
+        self.offsets = np.load(offsets_path, mmap_mode="r")
+
+        with open(data_path, "rb") as f:
+            # mmap rejects zero-length files
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.offsets[-1] else b""
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Document, List[Document]]:
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("chunk index out of range")
+
+        start, end = int(self.offsets[idx]), int(self.offsets[idx + 1])
+        record = json.loads(self._data[start:end].decode("utf-8"))
+        return Document(content=record["content"], metadata=record["metadata"])
+
+    def __iter__(self) -> Iterator[Document]:
+        for idx in range(len(self)):
+            yield self[idx]
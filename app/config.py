@@ -1,4 +1,5 @@
 import os
+from botocore.config import Config
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,4 +7,12 @@ load_dotenv()
 AWS_REGION = os.getenv("AWS_REGION")
 AWS_PROFILE = os.getenv("AWS_PROFILE")
 
-EMBEDDING_MODEL_ID = "amazon.titan-embed-text-v2:0"
\ No newline at end of file
+EMBEDDING_MODEL_ID = "amazon.titan-embed-text-v2:0"
+
+# botocore "standard" retry mode for every bedrock-runtime client (attempts include the first call);
+# app/fake_bedrock.py emulates the same mode for load tests
+BEDROCK_MAX_ATTEMPTS = 3
+BEDROCK_CLIENT_CONFIG = Config(retries={"mode": "standard", "total_max_attempts": BEDROCK_MAX_ATTEMPTS})
+
+# Memory-map the published index read-only so worker processes share one copy
+INDEX_MMAP = os.getenv("INDEX_MMAP", "true").lower() == "true"
@@ -2,13 +2,15 @@ import json
 import boto3
 from typing import List
 from app.models import Document
-from app.config import AWS_REGION, AWS_PROFILE, EMBEDDING_MODEL_ID
+from app.config import AWS_REGION, AWS_PROFILE, EMBEDDING_MODEL_ID, BEDROCK_CLIENT_CONFIG
 
 class BedrockEmbedder:
 
-    def __init__(self):
-        session = boto3.Session(profile_name=AWS_PROFILE, region_name=AWS_REGION)
-        self.client = session.client("bedrock-runtime")
+    def __init__(self, client=None):
+        if client is None:
+            session = boto3.Session(profile_name=AWS_PROFILE, region_name=AWS_REGION)
+            client = session.client("bedrock-runtime", config=BEDROCK_CLIENT_CONFIG)
+        self.client = client
 
     def embed_documents(self, documents: List[Document]) -> List[List[float]]:
         embeddings = []
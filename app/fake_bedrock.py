@@ -0,0 +1,263 @@
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from io import BytesIO
+from dataclasses import dataclass, field
+from typing import List, Optional
+import numpy as np
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+from app.config import BEDROCK_MAX_ATTEMPTS
+
+
+@dataclass
+class LatencyProfile:
+    """
+    Latency of one simulated Bedrock call.
+    distribution is "fixed", "uniform" (median_ms +/- spread fraction)
+    or "lognormal" (spread is sigma).
+    """
+    distribution: str = "lognormal"
+    median_ms: float = 50.0
+    spread: float = 0.3
+    per_token_ms: float = 0.0
+
+    def __post_init__(self):
+        if self.distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+        if self.median_ms < 0 or self.spread < 0 or self.per_token_ms < 0:
+            raise ValueError("Latency settings must not be negative")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median_ms == 0:
+            return 0.0
+        if self.distribution == "fixed":
+            ms = self.median_ms
+        elif self.distribution == "uniform":
+            ms = rng.uniform(self.median_ms * (1 - self.spread), self.median_ms * (1 + self.spread))
+        else:
+            ms = rng.lognormvariate(math.log(self.median_ms), self.spread)
+        return max(ms, 0.0) / 1000
+
+
+@dataclass
+class FakeBedrockConfig:
+    embedding_latency: LatencyProfile = field(default_factory=lambda: LatencyProfile(median_ms=40))
+    # Time to first token; per_token_ms is added for every generated token
+    llm_latency: LatencyProfile = field(default_factory=lambda: LatencyProfile(median_ms=600, per_token_ms=20))
+    output_tokens: int = 150
+    embedding_dim: int = 1024
+    # Requests per second allowed across all models; None disables throttling
+    max_tps: Optional[float] = None
+    burst: int = 10
+    # How long Bedrock takes to reject a throttled request
+    throttle_latency_ms: float = 20.0
+    # Attempts per call, as botocore's "standard" retry mode (1 disables retries)
+    max_attempts: int = BEDROCK_MAX_ATTEMPTS
+    error_rate: float = 0.0
+    error_codes: List[str] = field(default_factory=lambda: [
+        "ServiceUnavailableException", "ModelTimeoutException", "InternalServerException"
+    ])
+    seed: Optional[int] = None
+
+
+class FakeBedrockRuntime:
+    """
+    Local stand-in for the bedrock-runtime client, for load tests that must
+    not hit live Bedrock. Supports invoke_model and
+    invoke_model_with_response_stream for Titan embeddings and Claude messages,
+    with simulated latency, token-bucket throttling and injected errors
+    raised as botocore ClientErrors.
+
+    Failed attempts take time like the real service. Retries follow
+    botocore's "standard" retry mode: the mode BedrockEmbedder and
+    ClaudeClient configure through BEDROCK_CLIENT_CONFIG. Throttling and
+    5xx errors are retried with full-jitter exponential backoff, and
+    ModelTimeoutException (408) is not retried. Callers therefore see the
+    latency and error rates production would, not instant failures.
+    """
+
+    # Codes botocore's standard retry mode treats as retryable for this API
+    RETRYABLE_CODES = ("ThrottlingException", "ServiceUnavailableException", "InternalServerException")
+    MAX_BACKOFF = 20.0
+
+    def __init__(self, config: Optional[FakeBedrockConfig] = None):
+        self.config = config or FakeBedrockConfig()
+        if self.config.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._tokens = float(self.config.burst)
+        self._last_refill = time.monotonic()
+
+    def invoke_model(self, modelId: str, body, contentType: str = "application/json", accept: str = "application/json"):
+        payload = self._admit("InvokeModel", modelId, body)
+
+        if modelId.startswith("amazon.titan-embed"):
+            time.sleep(self._sample(self.config.embedding_latency))
+            response_body = self._embedding_response(payload)
+        elif modelId.startswith("anthropic."):
+            output_tokens = self._output_tokens(payload)
+            latency = self.config.llm_latency
+            time.sleep(self._sample(latency) + output_tokens * latency.per_token_ms / 1000)
+            response_body = self._message_response(payload, output_tokens)
+        else:
+            raise self._error("ValidationException", f"Unsupported model: {modelId}", 400, "InvokeModel")
+
+        data = json.dumps(response_body).encode("utf-8")
+        return {
+            "body": StreamingBody(BytesIO(data), len(data)),
+            "contentType": "application/json"
+        }
+
+    def invoke_model_with_response_stream(self, modelId: str, body, contentType: str = "application/json", accept: str = "application/json"):
+        payload = self._admit("InvokeModelWithResponseStream", modelId, body)
+
+        if not modelId.startswith("anthropic."):
+            raise self._error(
+                "ValidationException", f"Streaming not supported for model: {modelId}", 400,
+                "InvokeModelWithResponseStream"
+            )
+
+        return {
+            "body": self._stream_events(payload),
+            "contentType": "application/json"
+        }
+
+    def _admit(self, operation: str, model_id: str, body) -> dict:
+        """
+        Run the throttling and error-injection checks, retrying like botocore.
+        Raises the last ClientError once attempts are exhausted.
+        """
+        for attempt in range(1, self.config.max_attempts + 1):
+            try:
+                self._attempt(operation, model_id)
+                break
+            except ClientError as e:
+                if e.response["Error"]["Code"] not in self.RETRYABLE_CODES or attempt == self.config.max_attempts:
+                    raise
+                with self._lock:
+                    # botocore: rand * min(2 ** (attempt_number - 1), 20s)
+                    backoff = self._rng.random() * min(self.MAX_BACKOFF, 2 ** (attempt - 1))
+                time.sleep(backoff)
+
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        return json.loads(body)
+
+    def _attempt(self, operation: str, model_id: str):
+        with self._lock:
+            throttled = False
+            if self.config.max_tps is not None:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.config.burst,
+                    self._tokens + (now - self._last_refill) * self.config.max_tps
+                )
+                self._last_refill = now
+                throttled = self._tokens < 1
+                if not throttled:
+                    self._tokens -= 1
+
+            code = None
+            if not throttled and self._rng.random() < self.config.error_rate:
+                code = self._rng.choice(self.config.error_codes)
+
+        if throttled:
+            time.sleep(self.config.throttle_latency_ms / 1000)
+            raise self._error("ThrottlingException", "Too many requests, please wait before trying again.", 429, operation)
+
+        if code is not None:
+            # Injected failures arrive after a normal call's worth of latency
+            profile = self.config.embedding_latency if model_id.startswith("amazon.titan-embed") else self.config.llm_latency
+            time.sleep(self._sample(profile))
+            raise self._error(code, "Injected failure", 500 if code != "ModelTimeoutException" else 408, operation)
+
+    def _sample(self, profile: LatencyProfile) -> float:
+        with self._lock:
+            return profile.sample(self._rng)
+
+    def _output_tokens(self, payload: dict) -> int:
+        return max(1, min(payload.get("max_tokens", self.config.output_tokens), self.config.output_tokens))
+
+    def _embedding_response(self, payload: dict) -> dict:
+        text = payload["inputText"]
+        dim = payload.get("dimensions", self.config.embedding_dim)
+
+        # Deterministic per text so repeated queries embed identically
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(dim)
+        vector /= np.linalg.norm(vector)
+
+        return {
+            "embedding": vector.tolist(),
+            "inputTextTokenCount": len(text.split())
+        }
+
+    def _message_response(self, payload: dict, output_tokens: int) -> dict:
+        return {
+            "id": "msg_fake",
+            "type": "message",
+            "role": "assistant",
+            "content": [{"type": "text", "text": self._output_text(output_tokens)}],
+            "stop_reason": "end_turn",
+            "usage": {
+                "input_tokens": self._input_tokens(payload),
+                "output_tokens": output_tokens
+            }
+        }
+
+    def _stream_events(self, payload: dict):
+        output_tokens = self._output_tokens(payload)
+        latency = self.config.llm_latency
+
+        time.sleep(self._sample(latency))
+        yield self._event({
+            "type": "message_start",
+            "message": {
+                "id": "msg_fake", "type": "message", "role": "assistant", "content": [],
+                "usage": {"input_tokens": self._input_tokens(payload), "output_tokens": 0}
+            }
+        })
+        yield self._event({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+
+        for word in self._output_text(output_tokens).split(" "):
+            time.sleep(latency.per_token_ms / 1000)
+            yield self._event({
+                "type": "content_block_delta", "index": 0,
+                "delta": {"type": "text_delta", "text": word + " "}
+            })
+
+        yield self._event({"type": "content_block_stop", "index": 0})
+        yield self._event({
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn"},
+            "usage": {"output_tokens": output_tokens}
+        })
+        yield self._event({"type": "message_stop"})
+
+    @staticmethod
+    def _event(data: dict) -> dict:
+        return {"chunk": {"bytes": json.dumps(data).encode("utf-8")}}
+
+    @staticmethod
+    def _input_tokens(payload: dict) -> int:
+        # Rough 4-characters-per-token estimate
+        return sum(len(str(m["content"])) for m in payload.get("messages", [])) // 4
+
+    @staticmethod
+    def _output_text(output_tokens: int) -> str:
+        return " ".join(["lorem"] * output_tokens)
+
+    @staticmethod
+    def _error(code: str, message: str, status: int, operation: str) -> ClientError:
+        return ClientError(
+            {
+                "Error": {"Code": code, "Message": message},
+                "ResponseMetadata": {"HTTPStatusCode": status}
+            },
+            operation
+        )
@@ -0,0 +1,311 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from app.vector_store import FaissVectorStore
+from app.chunk_store import write_chunk_store
+
+INDEX_FILE = "faiss.index"
+DOCS_FILE = "documents.pkl"
+CHUNKS_FILE = "chunks.bin"
+CHUNK_OFFSETS_FILE = "chunks.offsets.npy"
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fsync_file(path: str):
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def _fsync_dir(path: str):
+    # Makes renames inside path durable; directories can't be opened on Windows
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_atomic(path: str, data: str):
+    tmp_path = f"{path}.tmp-{uuid.uuid4().hex}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(path) or ".")
+
+
+def current_version(root: str) -> Optional[str]:
+    """
+    Return the version named by root/CURRENT, or None if nothing is published yet.
+    """
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def list_versions(root: str) -> List[str]:
+    versions_root = os.path.join(root, VERSIONS_DIR)
+    if not os.path.isdir(versions_root):
+        return []
+
+    # Hidden names are staging directories still being written by a publisher
+    return sorted(
+        name for name in os.listdir(versions_root)
+        if not name.startswith(".")
+        and os.path.exists(os.path.join(versions_root, name, MANIFEST_FILE))
+    )
+
+
+def publish_snapshot(vector_store: FaissVectorStore, root: str, keep: int = 3) -> str:
+    """
+    Write vector_store as a new immutable version under root/versions and
+    point root/CURRENT at it.
+
+    Files are written into a hidden staging directory and only renamed into
+    place once the manifest (with checksums) is complete, so readers never
+    observe a half-written index/documents pair. Data files and directories
+    are fsynced before CURRENT moves, so a crash can't leave it pointing at
+    a version that isn't fully on disk.
+    """
+    versions_root = os.path.join(root, VERSIONS_DIR)
+    os.makedirs(versions_root, exist_ok=True)
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f") + "-" + uuid.uuid4().hex[:8]
+    staging_dir = os.path.join(versions_root, f".staging-{version}")
+    os.makedirs(staging_dir)
+
+    try:
+        index_path = os.path.join(staging_dir, INDEX_FILE)
+        docs_path = os.path.join(staging_dir, DOCS_FILE)
+        chunks_path = os.path.join(staging_dir, CHUNKS_FILE)
+        offsets_path = os.path.join(staging_dir, CHUNK_OFFSETS_FILE)
+        vector_store.save(index_path, docs_path)
+        write_chunk_store(vector_store.documents, chunks_path, offsets_path)
+        for path in (index_path, docs_path, chunks_path, offsets_path):
+            _fsync_file(path)
+
+        manifest = {
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "embedding_dim": vector_store.embedding_dim,
+            "num_documents": len(vector_store.documents),
+            "files": {
+                INDEX_FILE: _sha256(index_path),
+                DOCS_FILE: _sha256(docs_path),
+                CHUNKS_FILE: _sha256(chunks_path),
+                CHUNK_OFFSETS_FILE: _sha256(offsets_path)
+            }
+        }
+        _write_atomic(os.path.join(staging_dir, MANIFEST_FILE), json.dumps(manifest, indent=2))
+
+        os.rename(staging_dir, os.path.join(versions_root, version))
+        _fsync_dir(versions_root)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    _write_atomic(os.path.join(root, CURRENT_FILE), version + "\n")
+    prune_versions(root, keep=keep)
+
+    return version
+
+
+def prune_versions(root: str, keep: int = 3):
+    """
+    Remove all but the newest `keep` versions. The CURRENT version is never removed.
+    """
+    active = current_version(root)
+    stale = [v for v in list_versions(root)[:-keep] if v != active] if keep > 0 else []
+
+    for version in stale:
+        shutil.rmtree(os.path.join(root, VERSIONS_DIR, version), ignore_errors=True)
+
+    cleanup_staging(root)
+
+
+def cleanup_staging(root: str, max_age: float = 3600.0):
+    """
+    Remove staging directories left behind by publishers that died mid-write.
+    Only directories older than max_age seconds are touched, so a publish in
+    progress elsewhere is never removed.
+    """
+    versions_root = os.path.join(root, VERSIONS_DIR)
+    if not os.path.isdir(versions_root):
+        return
+
+    cutoff = time.time() - max_age
+    for name in os.listdir(versions_root):
+        path = os.path.join(versions_root, name)
+        if not name.startswith(".staging-"):
+            continue
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except FileNotFoundError:
+            # Renamed into place or cleaned up by another process
+            pass
+
+
+def load_snapshot(root: str, version: Optional[str] = None, mmap: bool = False) -> Tuple[str, FaissVectorStore]:
+    """
+    Load a published version after verifying its checksums.
+    With mmap=True the index and chunks are memory-mapped read-only instead of
+    copied into this process.
+
+    Without an explicit version, CURRENT is tried first; if it is missing or
+    damaged, the newest other version that verifies is loaded instead.
+    """
+    if version is not None:
+        return version, _load_version(root, version, mmap)
+
+    active = current_version(root)
+    candidates = ([active] if active else []) + [v for v in reversed(list_versions(root)) if v != active]
+    if not candidates:
+        raise FileNotFoundError(f"No published index version in {root}")
+
+    errors = []
+    for candidate in candidates:
+        try:
+            vector_store = _load_version(root, candidate, mmap)
+        except (OSError, ValueError, KeyError) as e:
+            errors.append(e)
+            print(f"[Index] WARNING: cannot load index version {candidate}: {e}")
+            continue
+
+        if candidate != active:
+            print(f"[Index] WARNING: falling back to index version {candidate} (CURRENT is {active})")
+        return candidate, vector_store
+
+    raise errors[-1]
+
+
+def _load_version(root: str, version: str, mmap: bool) -> FaissVectorStore:
+    version_dir = os.path.join(root, VERSIONS_DIR, version)
+    with open(os.path.join(version_dir, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    for file_name, checksum in manifest["files"].items():
+        if _sha256(os.path.join(version_dir, file_name)) != checksum:
+            raise ValueError(f"Checksum mismatch for {file_name} in index version {version}")
+
+    vector_store = FaissVectorStore(embedding_dim=manifest["embedding_dim"])
+    # Versions published before the chunk store existed only have the pickle
+    if mmap and CHUNKS_FILE in manifest["files"]:
+        vector_store.load_mmap(
+            os.path.join(version_dir, INDEX_FILE),
+            os.path.join(version_dir, CHUNKS_FILE),
+            os.path.join(version_dir, CHUNK_OFFSETS_FILE)
+        )
+    else:
+        vector_store.load(
+            os.path.join(version_dir, INDEX_FILE),
+            os.path.join(version_dir, DOCS_FILE)
+        )
+
+    return vector_store
+
+
+class IndexWatcher:
+    """
+    Serves searches from the CURRENT index version and hot-swaps to newly
+    published versions in the background.
+
+    Each search call grabs the active store once, so in-flight queries finish
+    on the version they started with while new queries see the new one.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        vector_store: Optional[FaissVectorStore] = None,
+        version: Optional[str] = None,
+        poll_interval: float = 10.0,
+        mmap: bool = False
+    ):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.mmap = mmap
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if vector_store is None:
+            version, vector_store = load_snapshot(root, mmap=mmap)
+
+        self._active: Tuple[Optional[str], FaissVectorStore] = (version, vector_store)
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._active[0]
+
+    @property
+    def vector_store(self) -> FaissVectorStore:
+        return self._active[1]
+
+    def search(self, query_embedding: List[float], top_k: int = 5):
+        return self.vector_store.search(query_embedding, top_k=top_k)
+
+    def search_mmr(self, query_embedding: List[float], top_k: int = 5, fetch_k: int = 30, lambda_mult: float = 0.5):
+        return self.vector_store.search_mmr(
+            query_embedding, top_k=top_k, fetch_k=fetch_k, lambda_mult=lambda_mult
+        )
+
+    def refresh(self) -> bool:
+        """
+        Load and swap in the CURRENT version if it differs from the active one.
+        Returns True if a swap happened.
+        """
+        with self._lock:
+            latest = current_version(self.root)
+            if latest is None or latest == self.version:
+                return False
+
+            # Searches don't take the lock, so they keep running on the old version
+            version, vector_store = load_snapshot(self.root, latest, mmap=self.mmap)
+            self._active = (version, vector_store)
+
+        print(f"[Index] Swapped to index version {version}")
+        return True
+
+    def start(self):
+        if self._thread is not None:
+            return self
+
+        self._thread = threading.Thread(target=self._run, name="index-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the current version; retry on the next poll
+                print(f"[Index] Failed to load new index version: {e}")
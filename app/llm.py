@@ -1,13 +1,15 @@
 import json
 import boto3
-from app.config import AWS_REGION, AWS_PROFILE
+from app.config import AWS_REGION, AWS_PROFILE, BEDROCK_CLIENT_CONFIG
 
 CLAUDE_MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"
 
 class ClaudeClient:
-    def __init__(self):
-        session = boto3.Session(profile_name=AWS_PROFILE, region_name=AWS_REGION)
-        self.client = session.client("bedrock-runtime")
+    def __init__(self, client=None):
+        if client is None:
+            session = boto3.Session(profile_name=AWS_PROFILE, region_name=AWS_REGION)
+            client = session.client("bedrock-runtime", config=BEDROCK_CLIENT_CONFIG)
+        self.client = client
 
     def generate(self, prompt: str, max_tokens: int = 500) -> str:
         payload = {
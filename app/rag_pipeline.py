@@ -5,16 +5,18 @@ from app.llm import ClaudeClient
 
 
 class RAGPipeline:
-    def __init__(self, vector_store: FaissVectorStore):
-        self.embedder = BedrockEmbedder()
+    def __init__(self, vector_store: FaissVectorStore, embedder: BedrockEmbedder = None, llm: ClaudeClient = None):
+        self.embedder = embedder or BedrockEmbedder()
         self.vector_store = vector_store
-        self.llm = ClaudeClient()
+        self.llm = llm or ClaudeClient()
 
-    def answer(self, question: str, top_k: int = 10) -> str:
+    def answer(self, question: str, top_k: int = 5, fetch_k: int = 30) -> str:
         query_doc = Document(content=question, metadata={"type": "query"})
         query_embedding = self.embedder.embed_documents([query_doc])[0]
 
-        retrieved_docs = self.vector_store.search(query_embedding, top_k=top_k)
+        retrieved_docs = self.vector_store.search_mmr(
+            query_embedding, top_k=top_k, fetch_k=fetch_k
+        )
 
         # 🔍 DEBUG: Print retrieved chunks
         print("\n--- Retrieved Chunks from Vector DB ---")
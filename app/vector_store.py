@@ -3,14 +3,60 @@ import numpy as np
 import pickle
 from typing import List
 from app.models import Document
+from app.chunk_store import MmapChunkStore
+
+
+def maximal_marginal_relevance(
+    query_vector: np.ndarray,
+    candidate_vectors: np.ndarray,
+    top_k: int = 5,
+    lambda_mult: float = 0.5
+) -> List[int]:
+    """
+    Pick top_k diverse rows of candidate_vectors using Maximal Marginal Relevance.
+    Returns positions into candidate_vectors in selection order.
+    """
+    if len(candidate_vectors) == 0 or top_k <= 0:
+        return []
+
+    # Cosine similarity via normalised vectors
+    query = query_vector / max(np.linalg.norm(query_vector), 1e-12)
+    norms = np.linalg.norm(candidate_vectors, axis=1, keepdims=True)
+    candidates = candidate_vectors / np.maximum(norms, 1e-12)
+
+    query_sim = candidates @ query
+    pairwise_sim = candidates @ candidates.T
+
+    top_k = min(top_k, len(candidates))
+    selected = [int(np.argmax(query_sim))]
+    max_sim_to_selected = pairwise_sim[:, selected[0]].copy()
+    available = np.ones(len(candidates), dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < top_k:
+        scores = lambda_mult * query_sim - (1 - lambda_mult) * max_sim_to_selected
+        scores[~available] = -np.inf
+
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_sim_to_selected, pairwise_sim[:, best], out=max_sim_to_selected)
+
+    return selected
+
 
 class FaissVectorStore:
     def __init__(self, embedding_dim: int):
         self.embedding_dim = embedding_dim
         self.index = faiss.IndexFlatL2(embedding_dim)
         self.documents: List[Document] = []
+        self.read_only = False
 
     def add_embeddings(self, embeddings: List[List[float]], documents: List[Document]):
+        # faiss aborts the process when adding to a memory-mapped index
+        if self.read_only:
+            raise RuntimeError("Cannot add embeddings to a read-only (memory-mapped) vector store")
+
         vectors = np.array(embeddings).astype("float32")
         self.index.add(vectors)
         self.documents.extend(documents)
@@ -25,12 +71,56 @@ class FaissVectorStore:
 
         return results
 
+    def search_mmr(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        fetch_k: int = 30,
+        lambda_mult: float = 0.5
+    ):
+        """
+        Fetch fetch_k nearest chunks, then re-rank them with MMR so that
+        near-duplicate neighbours (chunk overlap, repeated OCR pages) are
+        not all returned together.
+        """
+        if self.index.ntotal == 0 or top_k <= 0:
+            return []
+
+        query_vector = np.array([query_embedding]).astype("float32")
+        fetch_k = min(max(fetch_k, top_k), self.index.ntotal)
+        distances, indices = self.index.search(query_vector, fetch_k)
+
+        candidate_ids = indices[0][indices[0] >= 0]
+        if len(candidate_ids) == 0:
+            return []
+
+        candidate_vectors = self.index.reconstruct_batch(candidate_ids)
+        selected = maximal_marginal_relevance(
+            query_vector[0], candidate_vectors, top_k=top_k, lambda_mult=lambda_mult
+        )
+
+        return [self.documents[candidate_ids[i]] for i in selected]
+
     def save(self, index_path: str, docs_path: str):
         faiss.write_index(self.index, index_path)
         with open(docs_path, "wb") as f:
-            pickle.dump(self.documents, f)
+            # list() so a memory-mapped chunk store is pickled as plain Documents
+            pickle.dump(list(self.documents), f)
 
     def load(self, index_path: str, docs_path: str):
         self.index = faiss.read_index(index_path)
+        self.embedding_dim = self.index.d
+        self.read_only = False
         with open(docs_path, "rb") as f:
             self.documents = pickle.load(f)
+
+    def load_mmap(self, index_path: str, chunks_path: str, offsets_path: str):
+        """
+        Open the index and chunk store as read-only memory maps so that every
+        process serving the same files shares one physical copy.
+        The store cannot be added to after this.
+        """
+        self.index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY)
+        self.embedding_dim = self.index.d
+        self.documents = MmapChunkStore(chunks_path, offsets_path)
+        self.read_only = True
@@ -0,0 +1,234 @@
+import argparse
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from app.fake_bedrock import FakeBedrockConfig, FakeBedrockRuntime, LatencyProfile
+from app.embedder import BedrockEmbedder
+from app.llm import ClaudeClient
+from app.vector_store import FaissVectorStore
+from app.index_store import current_version, load_snapshot
+from app.rag_pipeline import RAGPipeline
+from app.models import Document
+from app.config import INDEX_MMAP, BEDROCK_MAX_ATTEMPTS
+
+INDEX_ROOT = "data/index"
+INDEX_PATH = "data/index/faiss.index"
+DOCS_PATH = "data/index/documents.pkl"
+
+QUESTIONS = [
+    "What is the moral of the story about the thirsty crow?",
+    "Why did the lion spare the mouse?",
+    "प्यासे कौवे की कहानी से क्या सीख मिलती है?",
+    "అపకారికి ఉపకారం చేయరాదు అనే కథలో ఏమి జరిగింది?",
+    "Quelle est la morale de l'histoire du lièvre et de la tortue ?"
+]
+
+STAGES = ["embed", "retrieve", "generate"]
+
+_request = threading.local()
+
+
+def timed(stage, fn):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _request.stages[stage] = time.perf_counter() - start
+    return wrapper
+
+
+def instrument(rag: RAGPipeline):
+    """Record per-stage timings of each answer() call in thread-local state."""
+    rag.embedder.embed_documents = timed("embed", rag.embedder.embed_documents)
+    rag.vector_store.search_mmr = timed("retrieve", rag.vector_store.search_mmr)
+    rag.llm.generate = timed("generate", rag.llm.generate)
+
+
+def load_store(synthetic: int, embedding_dim: int) -> FaissVectorStore:
+    if synthetic:
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((synthetic, embedding_dim)).astype("float32")
+        documents = [
+            Document(content=f"Synthetic chunk {i}. " * 40, metadata={"source": "synthetic", "page": i, "ocr": False})
+            for i in range(synthetic)
+        ]
+        vector_store = FaissVectorStore(embedding_dim=embedding_dim)
+        vector_store.add_embeddings(vectors, documents)
+        return vector_store
+
+    if current_version(INDEX_ROOT):
+        return load_snapshot(INDEX_ROOT, mmap=INDEX_MMAP)[1]
+
+    if os.path.exists(INDEX_PATH) and os.path.exists(DOCS_PATH):
+        vector_store = FaissVectorStore(embedding_dim=embedding_dim)
+        vector_store.load(INDEX_PATH, DOCS_PATH)
+        return vector_store
+
+    raise SystemExit("No FAISS index found; build one with main.py or pass --synthetic N")
+
+
+def run_one(rag: RAGPipeline, question: str, scheduled: float, top_k: int) -> dict:
+    _request.stages = {}
+    error = None
+
+    try:
+        rag.answer(question, top_k=top_k)
+    except Exception as e:
+        error = getattr(e, "response", {}).get("Error", {}).get("Code") or type(e).__name__
+
+    return {
+        "latency": time.perf_counter() - scheduled,
+        "stages": dict(_request.stages),
+        "error": error
+    }
+
+
+def run_closed_loop(rag, concurrency, duration, top_k):
+    """Each of `concurrency` users sends its next request as soon as the last one returns."""
+    deadline = time.perf_counter() + duration
+
+    def user(user_id):
+        rng = random.Random(user_id)
+        results = []
+        while time.perf_counter() < deadline:
+            results.append(run_one(rag, rng.choice(QUESTIONS), time.perf_counter(), top_k))
+        return results
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        per_user = list(pool.map(user, range(concurrency)))
+
+    return [r for results in per_user for r in results]
+
+
+def run_open_loop(rag, qps, duration, top_k, max_inflight, seed):
+    """
+    Poisson arrivals at `qps` regardless of how fast requests complete.
+    Latency is measured from the scheduled arrival, so queueing delay counts.
+    """
+    rng = random.Random(seed)
+    futures = []
+    start = time.perf_counter()
+    next_arrival = start
+
+    with ThreadPoolExecutor(max_workers=max_inflight) as pool:
+        while next_arrival < start + duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(run_one, rag, rng.choice(QUESTIONS), next_arrival, top_k))
+            next_arrival += rng.expovariate(qps)
+
+    return [f.result() for f in futures]
+
+
+def percentiles_ms(values):
+    if not values:
+        return "n/a"
+    p50, p95, p99 = np.percentile(np.array(values) * 1000, [50, 95, 99])
+    return f"p50={p50:8.1f}  p95={p95:8.1f}  p99={p99:8.1f}"
+
+
+def report(results, elapsed):
+    ok = [r for r in results if r["error"] is None]
+    errors = Counter(r["error"] for r in results if r["error"] is not None)
+
+    print(f"Requests: {len(results)}  ok: {len(ok)}  errors: {sum(errors.values())}")
+    for code, count in errors.most_common():
+        print(f"  {code}: {count}")
+    print(f"Throughput: {len(ok) / elapsed:.2f} req/s over {elapsed:.1f}s")
+    # Stage rows use the same successful requests as the total row
+    print(f"{'total':>10}  {percentiles_ms([r['latency'] for r in ok])}  (ms, successful requests)")
+    for stage in STAGES:
+        print(f"{stage:>10}  {percentiles_ms([r['stages'][stage] for r in ok if stage in r['stages']])}")
+    failed = [r["latency"] for r in results if r["error"] is not None]
+    print(f"{'failed':>10}  {percentiles_ms(failed)}  (ms, time to failure)")
+
+
+def check_gate(results, max_p95_ms, max_error_rate) -> List[str]:
+    """Return the reasons this run fails the regression gate, if any."""
+    failures = []
+    if not results:
+        return ["no requests completed"]
+
+    error_rate = sum(r["error"] is not None for r in results) / len(results)
+    if error_rate > max_error_rate:
+        failures.append(f"error rate {error_rate:.2%} exceeds {max_error_rate:.2%}")
+
+    if max_p95_ms is not None:
+        ok_latencies = [r["latency"] for r in results if r["error"] is None]
+        p95 = np.percentile(np.array(ok_latencies) * 1000, 95) if ok_latencies else float("inf")
+        if p95 > max_p95_ms:
+            failures.append(f"p95 {p95:.1f}ms exceeds {max_p95_ms:.1f}ms")
+
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline load test of RAGPipeline against a local Bedrock stand-in")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=int, default=8, help="closed loop: concurrent users")
+    parser.add_argument("--qps", type=float, default=5.0, help="open loop: target arrival rate")
+    parser.add_argument("--max-inflight", type=int, default=256, help="open loop: worker threads")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--synthetic", type=int, default=0, help="use N random chunks instead of the on-disk index")
+    parser.add_argument("--embedding-dim", type=int, default=1024)
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--latency-spread", type=float, default=0.3)
+    parser.add_argument("--embed-ms", type=float, default=40.0)
+    parser.add_argument("--llm-ms", type=float, default=600.0, help="time to first token")
+    parser.add_argument("--llm-per-token-ms", type=float, default=20.0)
+    parser.add_argument("--output-tokens", type=int, default=150)
+    parser.add_argument("--max-tps", type=float, default=None, help="throttle Bedrock calls above this rate")
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("--max-attempts", type=int, default=BEDROCK_MAX_ATTEMPTS, help="SDK attempts per Bedrock call, incl. retries")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="exit non-zero if successful p95 exceeds this")
+    parser.add_argument("--max-error-rate", type=float, default=0.0, help="exit non-zero if the failed fraction exceeds this")
+    args = parser.parse_args()
+
+    try:
+        client = FakeBedrockRuntime(FakeBedrockConfig(
+            embedding_latency=LatencyProfile(args.latency_dist, args.embed_ms, args.latency_spread),
+            llm_latency=LatencyProfile(args.latency_dist, args.llm_ms, args.latency_spread, args.llm_per_token_ms),
+            output_tokens=args.output_tokens,
+            embedding_dim=args.embedding_dim,
+            max_tps=args.max_tps,
+            burst=args.burst,
+            max_attempts=args.max_attempts,
+            error_rate=args.error_rate,
+            seed=args.seed
+        ))
+    except ValueError as e:
+        parser.error(str(e))
+
+    vector_store = load_store(args.synthetic, args.embedding_dim)
+    rag = RAGPipeline(vector_store, embedder=BedrockEmbedder(client=client), llm=ClaudeClient(client=client))
+    instrument(rag)
+
+    start = time.perf_counter()
+    # answer() prints its retrieved chunks; keep them out of the report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if args.mode == "closed":
+            results = run_closed_loop(rag, args.concurrency, args.duration, args.top_k)
+        else:
+            results = run_open_loop(rag, args.qps, args.duration, args.top_k, args.max_inflight, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"mode={args.mode} " + (f"concurrency={args.concurrency}" if args.mode == "closed" else f"qps={args.qps}"))
+    report(results, elapsed)
+
+    gate_failures = check_gate(results, args.max_p95_ms, args.max_error_rate)
+    for reason in gate_failures:
+        print(f"FAIL: {reason}")
+    if gate_failures:
+        sys.exit(1)
@@ -1,55 +1,92 @@
 import os
+import sys
 import glob
 from app.loaders.pdf_loader import PDFLoader
 from app.chunker import TextChunker
 from app.embedder import BedrockEmbedder
 from app.vector_store import FaissVectorStore
+from app.index_store import current_version, load_snapshot, publish_snapshot
 from app.rag_pipeline import RAGPipeline
+from app.config import INDEX_MMAP
 
+INDEX_ROOT = "data/index"
+# Pre-versioning layout, still loaded if no snapshot has been published yet
 INDEX_PATH = "data/index/faiss.index"
 DOCS_PATH = "data/index/documents.pkl"
 
-def build_or_load_vector_store():
+def build_vector_store():
     embedder = BedrockEmbedder()
+    loader = PDFLoader()
+    chunker = TextChunker(chunk_size=200, overlap=20)
 
-    if os.path.exists(INDEX_PATH) and os.path.exists(DOCS_PATH):
-        print("Loading existing FAISS index...")
-        vector_store = FaissVectorStore(embedding_dim=1024)
-        vector_store.load(INDEX_PATH, DOCS_PATH)
-    else:
-        print("Building FAISS index for the first time (this may take a few minutes)...")
+    all_docs = []
+    pdf_files = glob.glob("data/raw/*.pdf")
 
-        loader = PDFLoader()
-        chunker = TextChunker(chunk_size=200, overlap=20)
+    if not pdf_files:
+        raise Exception("No PDF files found in data/raw folder")
 
-        all_docs = []
-        pdf_files = glob.glob("data/raw/*.pdf")
+    for file_path in pdf_files:
+        print(f"Loading: {file_path}")
+        all_docs.extend(loader.load(file_path))
 
-        if not pdf_files:
-            raise Exception("No PDF files found in data/raw folder")
+    print(f"Total pages loaded: {len(all_docs)}")
 
-        for file_path in pdf_files:
-            print(f"Loading: {file_path}")
-            all_docs.extend(loader.load(file_path))
+    chunks = chunker.chunk_documents(all_docs)
+    print(f"Total chunks created: {len(chunks)}")
 
-        print(f"Total pages loaded: {len(all_docs)}")
+    embeddings = embedder.embed_documents(chunks)
 
-        chunks = chunker.chunk_documents(all_docs)
-        print(f"Total chunks created: {len(chunks)}")
+    vector_store = FaissVectorStore(embedding_dim=len(embeddings[0]))
+    vector_store.add_embeddings(embeddings, chunks)
 
-        embeddings = embedder.embed_documents(chunks)
+    version = publish_snapshot(vector_store, INDEX_ROOT)
+    print(f"FAISS index built and published as version {version}.")
+
+    return vector_store
 
-        vector_store = FaissVectorStore(embedding_dim=len(embeddings[0]))
-        vector_store.add_embeddings(embeddings, chunks)
 
-        vector_store.save(INDEX_PATH, DOCS_PATH)
-        print("FAISS index built and saved successfully.")
+def build_or_load_vector_store():
+    if current_version(INDEX_ROOT):
+        version, vector_store = load_snapshot(INDEX_ROOT, mmap=INDEX_MMAP)
+        print(f"Loaded FAISS index version {version}")
+    elif os.path.exists(INDEX_PATH) and os.path.exists(DOCS_PATH):
+        print("Loading existing FAISS index (run with --publish-existing to serve it memory-mapped)...")
+        vector_store = FaissVectorStore(embedding_dim=1024)
+        vector_store.load(INDEX_PATH, DOCS_PATH)
+    else:
+        print("Building FAISS index for the first time (this may take a few minutes)...")
+        vector_store = build_vector_store()
 
     return vector_store
 
 
+def publish_existing_vector_store():
+    """
+    Publish the legacy faiss.index/documents.pkl pair as a snapshot version
+    without re-embedding, so it can be served memory-mapped and hot-reloaded.
+    """
+    if not (os.path.exists(INDEX_PATH) and os.path.exists(DOCS_PATH)):
+        raise Exception(f"No existing index found at {INDEX_PATH} and {DOCS_PATH}")
+
+    vector_store = FaissVectorStore(embedding_dim=1024)
+    vector_store.load(INDEX_PATH, DOCS_PATH)
+
+    version = publish_snapshot(vector_store, INDEX_ROOT)
+    print(f"Existing FAISS index published as version {version}.")
+
+
 if __name__ == "__main__":
 
+    # Publish a fresh index version; running servers pick it up without a restart
+    if "--rebuild" in sys.argv[1:]:
+        build_vector_store()
+        sys.exit(0)
+
+    # Migrate the pre-versioning index into a snapshot without calling Bedrock
+    if "--publish-existing" in sys.argv[1:]:
+        publish_existing_vector_store()
+        sys.exit(0)
+
     vector_store = build_or_load_vector_store()
     rag = RAGPipeline(vector_store)
 
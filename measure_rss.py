@@ -0,0 +1,96 @@
+import argparse
+import multiprocessing as mp
+import queue
+import time
+import numpy as np
+from app.index_store import load_snapshot
+
+INDEX_ROOT = "data/index"
+# Seconds to wait for workers to load the index and run their queries
+TIMEOUT = 300
+
+
+def memory_kb():
+    """
+    Read this process's memory from /proc (Linux only).
+    PSS splits shared pages between the processes mapping them, so summing
+    it over workers gives the real physical footprint.
+    """
+    stats = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                stats[key] = int(value.split()[0])
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                stats["Pss"] = int(line.split()[1])
+    return stats
+
+
+def worker(worker_id, use_mmap, num_queries, barrier, results):
+    version, vector_store = load_snapshot(INDEX_ROOT, mmap=use_mmap)
+
+    rng = np.random.default_rng(worker_id)
+    for _ in range(num_queries):
+        query = rng.random(vector_store.embedding_dim).tolist()
+        vector_store.search_mmr(query, top_k=5, fetch_k=30)
+
+    # Measure only once every worker holds its index, so sharing shows up in PSS
+    barrier.wait(timeout=TIMEOUT)
+    results.put((worker_id, memory_kb()))
+    barrier.wait(timeout=TIMEOUT)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-worker RSS/PSS of the loaded index")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--no-mmap", action="store_true", help="load private copies instead of mmap")
+    args = parser.parse_args()
+
+    use_mmap = not args.no_mmap
+    barrier = mp.Barrier(args.workers)
+    results = mp.Queue()
+
+    processes = [
+        mp.Process(target=worker, args=(i, use_mmap, args.queries, barrier, results))
+        for i in range(args.workers)
+    ]
+    for p in processes:
+        p.start()
+
+    rows = []
+    deadline = time.monotonic() + TIMEOUT
+    while len(rows) < len(processes) and time.monotonic() < deadline:
+        try:
+            rows.append(results.get(timeout=1))
+        except queue.Empty:
+            # A dead worker would leave the others stuck on the barrier
+            if any(p.exitcode not in (None, 0) for p in processes):
+                barrier.abort()
+                break
+
+    for p in processes:
+        p.join(timeout=TIMEOUT)
+        if p.is_alive():
+            p.terminate()
+            p.join()
+
+    failed = [i for i, p in enumerate(processes) if p.exitcode != 0]
+    if failed or len(rows) != len(processes):
+        raise SystemExit(f"Workers {failed} failed; see their tracebacks above")
+
+    rows.sort()
+
+    print(f"mode={'mmap' if use_mmap else 'private'} workers={args.workers}")
+    print(f"{'worker':>6} {'RSS MB':>9} {'anon MB':>9} {'file MB':>9} {'PSS MB':>9}")
+    for worker_id, stats in rows:
+        print(
+            f"{worker_id:>6} {stats['VmRSS'] / 1024:>9.1f} {stats['RssAnon'] / 1024:>9.1f} "
+            f"{stats['RssFile'] / 1024:>9.1f} {stats['Pss'] / 1024:>9.1f}"
+        )
+
+    total_pss = sum(stats["Pss"] for _, stats in rows) / 1024
+    print(f"Total PSS across workers: {total_pss:.1f} MB")
@@ -6,8 +6,10 @@ from app.loaders.pdf_loader import PDFLoader
 from app.chunker import TextChunker
 from app.embedder import BedrockEmbedder
 from app.vector_store import FaissVectorStore
+from app.index_store import IndexWatcher, current_version, publish_snapshot
 from app.rag_pipeline import RAGPipeline
 from app.models import Document
+from app.config import INDEX_MMAP
 
 # Page configuration
 st.set_page_config(
@@ -113,18 +115,22 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+INDEX_ROOT = "data/index"
+# Pre-versioning layout, still loaded if no snapshot has been published yet
 INDEX_PATH = "data/index/faiss.index"
 DOCS_PATH = "data/index/documents.pkl"
 
 @st.cache_resource
 def load_vector_store():
-    """Load or build the FAISS vector store"""
+    """Load or build the FAISS vector store, watching for newly published versions"""
     embedder = BedrockEmbedder()
     
-    if os.path.exists(INDEX_PATH) and os.path.exists(DOCS_PATH):
+    if current_version(INDEX_ROOT):
+        return IndexWatcher(INDEX_ROOT, mmap=INDEX_MMAP).start()
+    elif os.path.exists(INDEX_PATH) and os.path.exists(DOCS_PATH):
         vector_store = FaissVectorStore(embedding_dim=1024)
         vector_store.load(INDEX_PATH, DOCS_PATH)
-        return vector_store
+        return IndexWatcher(INDEX_ROOT, vector_store=vector_store, mmap=INDEX_MMAP).start()
     else:
         # Build index if not exists
         loader = PDFLoader()
@@ -154,21 +160,21 @@ def load_vector_store():
         vector_store = FaissVectorStore(embedding_dim=len(embeddings[0]))
         vector_store.add_embeddings(embeddings, chunks)
         
-        vector_store.save(INDEX_PATH, DOCS_PATH)
+        version = publish_snapshot(vector_store, INDEX_ROOT)
         
         progress_bar.empty()
         status_text.empty()
         
-        return vector_store
+        return IndexWatcher(INDEX_ROOT, vector_store=vector_store, version=version, mmap=INDEX_MMAP).start()
 
-def get_answer_with_context(rag: RAGPipeline, question: str, top_k: int = 10) -> Tuple[str, List[Document]]:
+def get_answer_with_context(rag: RAGPipeline, question: str, top_k: int = 5, fetch_k: int = 30) -> Tuple[str, List[Document]]:
     """Get answer and retrieved context"""
     from app.models import Document
     
     query_doc = Document(content=question, metadata={"type": "query"})
     query_embedding = rag.embedder.embed_documents([query_doc])[0]
     
-    retrieved_docs = rag.vector_store.search(query_embedding, top_k=top_k)
+    retrieved_docs = rag.vector_store.search_mmr(query_embedding, top_k=top_k, fetch_k=fetch_k)
     
     context = "\n\n".join([doc.content for doc in retrieved_docs])
     
@@ -304,7 +310,7 @@ def main():
                     answer, context_docs = get_answer_with_context(
                         st.session_state.rag, 
                         prompt, 
-                        top_k=10
+                        top_k=5
                     )
                     
                     st.markdown(answer)